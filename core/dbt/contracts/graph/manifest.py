@@ -323,9 +323,13 @@ def _get_locality(macro: ParsedMacro, root_project_name: str) -> Locality:
 
 
 class Searchable(Protocol):
-    resource_type: NodeType
     package_name: str
 
+    # a property, so documentation (with its fixed resource type) matches
+    @property
+    def resource_type(self) -> NodeType:
+        raise NotImplementedError('resource_type not implemented')
+
     @property
     def search_name(self) -> str:
         raise NotImplementedError('search_name not implemented')
@@ -363,6 +367,86 @@ class NameSearcher(Generic[N]):
         return None
 
 
+V = TypeVar('V')
+
+
+class IndexedDict(MutableMapping[str, V]):
+    """A mapping of unique IDs to values that also indexes the values by a
+    secondary key, so lookups by that key only have to look at the values
+    that could match. Subclasses define the key with _index_key.
+    """
+    def __init__(self, values: Optional[Mapping[str, V]] = None) -> None:
+        self._values: Dict[str, V] = {}
+        # index key -> unique ID -> value, in the same order as _values
+        self._index: Dict[str, Dict[str, V]] = {}
+        # record the index key of each value, in case it's mutated in-place
+        self._index_keys: Dict[str, str] = {}
+        if values is not None:
+            self.update(values)
+
+    def _index_key(self, value: V) -> str:
+        raise NotImplementedError('_index_key not implemented')
+
+    def _unindex(self, key: str) -> None:
+        index_key = self._index_keys.pop(key)
+        entries = self._index[index_key]
+        del entries[key]
+        if not entries:
+            del self._index[index_key]
+
+    def lookup(self, index_key: str) -> Iterable[V]:
+        """Return all the values with the given index key."""
+        return self._index.get(index_key, {}).values()
+
+    def __getitem__(self, key: str) -> V:
+        return self._values[key]
+
+    def __setitem__(self, key: str, value: V) -> None:
+        index_key = self._index_key(value)
+        moved = self._index_keys.get(key, index_key) != index_key
+        if moved:
+            self._unindex(key)
+        self._values[key] = value
+        self._index_keys[key] = index_key
+        entries = self._index.setdefault(index_key, {})
+        entries[key] = value
+        if moved and len(entries) > 1:
+            # the value keeps its place in _values, so keep the entries in
+            # the same order for lookups that take the first match
+            self._index[index_key] = {
+                k: v for k, v in self._values.items() if k in entries
+            }
+
+    def __delitem__(self, key: str) -> None:
+        del self._values[key]
+        self._unindex(key)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(type(self).__name__, self._values)
+
+
+class SearchableDict(IndexedDict[N]):
+    """An IndexedDict of searchable values, indexed by their search name."""
+    def _index_key(self, value: N) -> str:
+        return value.search_name
+
+
+class MacroDict(IndexedDict[ParsedMacro]):
+    """An IndexedDict of macros, indexed by their name."""
+    def _index_key(self, value: ParsedMacro) -> str:
+        return value.name
+
+
+class NodeDict(SearchableDict[CompileResultNode]):
+    """A SearchableDict of nodes, indexed by their search name."""
+
+
 @dataclass
 class Disabled:
     target: ParsedNode
@@ -372,15 +456,24 @@ class Disabled:
 class Manifest:
     """The manifest for the full graph, after parsing and during compilation.
     """
-    nodes: MutableMapping[str, CompileResultNode]
-    macros: MutableMapping[str, ParsedMacro]
-    docs: MutableMapping[str, ParsedDocumentation]
+    nodes: NodeDict
+    macros: MacroDict
+    docs: SearchableDict[ParsedDocumentation]
     generated_at: datetime
     disabled: List[ParsedNode]
     files: MutableMapping[str, SourceFile]
     metadata: ManifestMetadata = field(default_factory=ManifestMetadata)
     flat_graph: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        # untyped callers (mostly tests) pass plain dicts, index them here
+        if not isinstance(self.nodes, NodeDict):
+            self.nodes = NodeDict(self.nodes)
+        if not isinstance(self.macros, MacroDict):
+            self.macros = MacroDict(self.macros)
+        if not isinstance(self.docs, SearchableDict):
+            self.docs = SearchableDict(self.docs)
+
     @classmethod
     def from_macros(
         cls,
@@ -392,9 +485,9 @@ class Manifest:
         if files is None:
             files = {}
         return cls(
-            nodes={},
-            macros=macros,
-            docs={},
+            nodes=NodeDict(),
+            macros=MacroDict(macros),
+            docs=SearchableDict[ParsedDocumentation](),
             generated_at=datetime.utcnow(),
             disabled=[],
             files=files,
@@ -443,7 +536,7 @@ class Manifest:
         searcher: NameSearcher = NameSearcher(
             name, package, [NodeType.Documentation]
         )
-        result = searcher.search(self.docs.values())
+        result = searcher.search(self.docs.lookup(name))
         if result is not None:
             assert isinstance(result, ParsedDocumentation)
         return result
@@ -457,7 +550,7 @@ class Manifest:
         searcher: NameSearcher = NameSearcher(
             name, package, NodeType.refable()
         )
-        result = searcher.search(self.nodes.values())
+        result = searcher.search(self.nodes.lookup(name))
         if result is not None:
             assert not isinstance(result, ParsedSourceDefinition)
         return result
@@ -471,7 +564,7 @@ class Manifest:
 
         name = f'{source_name}.{table_name}'
         searcher: NameSearcher = NameSearcher(name, package, [NodeType.Source])
-        result = searcher.search(self.nodes.values())
+        result = searcher.search(self.nodes.lookup(name))
         if result is not None:
             assert isinstance(result, ParsedSourceDefinition)
         return result
@@ -485,7 +578,7 @@ class Manifest:
         """Find macros by their name.
         """
         candidates: CandidateList = CandidateList()
-        for unique_id, macro in self.macros.items():
+        for macro in self.macros.lookup(name):
             if macro.name != name:
                 continue
             candidate = MacroCandidate(
@@ -677,9 +770,15 @@ class Manifest:
 
     def deepcopy(self):
         return Manifest(
-            nodes={k: _deepcopy(v) for k, v in self.nodes.items()},
-            macros={k: _deepcopy(v) for k, v in self.macros.items()},
-            docs={k: _deepcopy(v) for k, v in self.docs.items()},
+            nodes=NodeDict(
+                {k: _deepcopy(v) for k, v in self.nodes.items()}
+            ),
+            macros=MacroDict(
+                {k: _deepcopy(v) for k, v in self.macros.items()}
+            ),
+            docs=SearchableDict(
+                {k: _deepcopy(v) for k, v in self.docs.items()}
+            ),
             generated_at=self.generated_at,
             disabled=[_deepcopy(n) for n in self.disabled],
             metadata=self.metadata,
@@ -704,9 +803,9 @@ class Manifest:
     @classmethod
     def from_writable_manifest(cls, writable):
         self = cls(
-            nodes=writable.nodes,
-            macros=writable.macros,
-            docs=writable.docs,
+            nodes=NodeDict(writable.nodes),
+            macros=MacroDict(writable.macros),
+            docs=SearchableDict(writable.docs),
             generated_at=writable.generated_at,
             metadata=writable.metadata,
             disabled=writable.disabled,
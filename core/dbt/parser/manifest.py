@@ -15,7 +15,9 @@ from dbt.clients.system import make_directory
 from dbt.config import Project, RuntimeConfig
 from dbt.context.docs import generate_runtime_docs
 from dbt.contracts.graph.compiled import CompileResultNode, NonSourceNode
-from dbt.contracts.graph.manifest import Manifest, FilePath, FileHash, Disabled
+from dbt.contracts.graph.manifest import (
+    Manifest, FilePath, FileHash, Disabled, NodeDict, MacroDict, SearchableDict
+)
 from dbt.contracts.graph.parsed import (
     ParsedSourceDefinition, ParsedNode, ParsedMacro, ColumnInfo
 )
@@ -303,7 +305,7 @@ class ManifestLoader:
         process_docs(manifest, self.root_project)
 
     def create_manifest(self) -> Manifest:
-        nodes: Dict[str, CompileResultNode] = {}
+        nodes = NodeDict()
         nodes.update(self.results.nodes)
         nodes.update(self.results.sources)
         disabled = []
@@ -311,8 +313,8 @@ class ManifestLoader:
             disabled.extend(value)
         manifest = Manifest(
             nodes=nodes,
-            macros=self.results.macros,
-            docs=self.results.docs,
+            macros=MacroDict(self.results.macros),
+            docs=SearchableDict(self.results.docs),
             generated_at=datetime.utcnow(),
             metadata=self.root_project.get_metadata(),
             disabled=disabled,
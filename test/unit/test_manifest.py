@@ -1,10 +1,11 @@
 import unittest
 from unittest import mock
 
-import copy
-from collections import namedtuple
+from dataclasses import dataclass
 from itertools import product
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 
 import pytest
 
@@ -22,7 +23,6 @@ from dbt.contracts.graph.parsed import (
 )
 from dbt.contracts.graph.compiled import CompiledModelNode
 from dbt.node_types import NodeType
-import freezegun
 
 
 REQUIRED_PARSED_NODE_KEYS = frozenset({
@@ -37,6 +37,159 @@ REQUIRED_COMPILED_NODE_KEYS = frozenset(REQUIRED_PARSED_NODE_KEYS | {
     'injected_sql', 'wrapped_sql'
 })
 
+GENERATED_AT = datetime(2018, 2, 14, 9, 15, 13)
+
+# values shared by the nested node fixtures
+RAW_SQL = 'does not matter'
+EVENTS_SQL = 'events.sql'
+MULTI_SQL = 'multi.sql'
+
+# the expected edges of the nested node fixtures where order doesn't matter
+MULTI_PARENTS = frozenset({'model.root.nested', 'model.root.sibling'})
+EVENTS_CHILDREN = frozenset({'model.root.dep', 'model.root.sibling'})
+
+
+@lru_cache(maxsize=1)
+def _model_config():
+    return NodeConfig.from_dict({
+        'enabled': True,
+        'materialized': 'view',
+        'persist_docs': {},
+        'post-hook': [],
+        'pre-hook': [],
+        'vars': {},
+        'quoting': {},
+        'column_types': {},
+        'tags': [],
+    })
+
+
+# The nested node fixtures are built once and shared between tests. Tests
+# only read the nodes, and copy the dict before adding to it.
+@lru_cache(maxsize=1)
+def _nested_nodes():
+    template = ParsedModelNode(
+        name='events',
+        database='dbt',
+        schema='analytics',
+        alias='events',
+        resource_type=NodeType.Model,
+        unique_id='model.snowplow.events',
+        fqn=['snowplow', 'events'],
+        package_name='snowplow',
+        refs=[],
+        sources=[],
+        depends_on=DependsOn(),
+        config=_model_config(),
+        tags=[],
+        path=EVENTS_SQL,
+        original_file_path=EVENTS_SQL,
+        root_path='',
+        meta={},
+        raw_sql=RAW_SQL
+    )
+    template.validate(template.to_dict())
+
+    def _make_model(name, package='root', deps=(), path=MULTI_SQL):
+        return template.replace(
+            name=name,
+            alias=name,
+            unique_id=f'model.{package}.{name}',
+            fqn=[package, name],
+            package_name=package,
+            refs=[['events']] if deps else [],
+            depends_on=DependsOn(nodes=list(deps)),
+            path=path,
+            original_file_path=path,
+        )
+
+    return {
+        'model.snowplow.events': template,
+        'model.root.events': _make_model('events', path=EVENTS_SQL),
+        'model.root.dep': _make_model('dep', deps=['model.root.events']),
+        'model.root.nested': _make_model('nested', deps=['model.root.dep']),
+        'model.root.sibling': _make_model(
+            'sibling', deps=['model.root.events']
+        ),
+        'model.root.multi': _make_model(
+            'multi', deps=['model.root.nested', 'model.root.sibling']
+        ),
+    }
+
+
+@lru_cache(maxsize=1)
+def _mixed_nested_nodes():
+    compiled_events = CompiledModelNode(
+        name='events',
+        database='dbt',
+        schema='analytics',
+        alias='events',
+        resource_type=NodeType.Model,
+        unique_id='model.snowplow.events',
+        fqn=['snowplow', 'events'],
+        package_name='snowplow',
+        refs=[],
+        sources=[],
+        depends_on=DependsOn(),
+        config=_model_config(),
+        tags=[],
+        path=EVENTS_SQL,
+        original_file_path=EVENTS_SQL,
+        root_path='',
+        raw_sql=RAW_SQL,
+        meta={},
+        compiled=True,
+        compiled_sql='also does not matter',
+        extra_ctes_injected=True,
+        injected_sql=None,
+        extra_ctes=[]
+    )
+    template = ParsedModelNode(
+        name='dep',
+        database='dbt',
+        schema='analytics',
+        alias='dep',
+        resource_type=NodeType.Model,
+        unique_id='model.root.dep',
+        fqn=['root', 'dep'],
+        package_name='root',
+        refs=[['events']],
+        sources=[],
+        depends_on=DependsOn(nodes=['model.root.events']),
+        config=_model_config(),
+        tags=[],
+        path=MULTI_SQL,
+        original_file_path=MULTI_SQL,
+        root_path='',
+        meta={},
+        raw_sql=RAW_SQL
+    )
+
+    def _make_model(name, deps):
+        return template.replace(
+            name=name,
+            alias=name,
+            unique_id=f'model.root.{name}',
+            fqn=['root', name],
+            depends_on=DependsOn(nodes=list(deps)),
+        )
+
+    return {
+        'model.snowplow.events': compiled_events,
+        'model.root.events': compiled_events.replace(
+            unique_id='model.root.events',
+            fqn=['root', 'events'],
+            package_name='root',
+            injected_sql='and this also does not matter',
+        ),
+        'model.root.dep': template,
+        'model.root.nested': _make_model('nested', ['model.root.dep']),
+        'model.root.sibling': _make_model('sibling', ['model.root.events']),
+        'model.root.multi': _make_model(
+            'multi', ['model.root.nested', 'model.root.sibling']
+        ),
+    }
+
 
 class ManifestTest(unittest.TestCase):
     def setUp(self):
@@ -44,147 +197,12 @@ class ManifestTest(unittest.TestCase):
 
         self.maxDiff = None
 
-        self.model_config = NodeConfig.from_dict({
-            'enabled': True,
-            'materialized': 'view',
-            'persist_docs': {},
-            'post-hook': [],
-            'pre-hook': [],
-            'vars': {},
-            'quoting': {},
-            'column_types': {},
-            'tags': [],
-        })
-
-        self.nested_nodes = {
-            'model.snowplow.events': ParsedModelNode(
-                name='events',
-                database='dbt',
-                schema='analytics',
-                alias='events',
-                resource_type=NodeType.Model,
-                unique_id='model.snowplow.events',
-                fqn=['snowplow', 'events'],
-                package_name='snowplow',
-                refs=[],
-                sources=[],
-                depends_on=DependsOn(),
-                config=self.model_config,
-                tags=[],
-                path='events.sql',
-                original_file_path='events.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-            'model.root.events': ParsedModelNode(
-                name='events',
-                database='dbt',
-                schema='analytics',
-                alias='events',
-                resource_type=NodeType.Model,
-                unique_id='model.root.events',
-                fqn=['root', 'events'],
-                package_name='root',
-                refs=[],
-                sources=[],
-                depends_on=DependsOn(),
-                config=self.model_config,
-                tags=[],
-                path='events.sql',
-                original_file_path='events.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-            'model.root.dep': ParsedModelNode(
-                name='dep',
-                database='dbt',
-                schema='analytics',
-                alias='dep',
-                resource_type=NodeType.Model,
-                unique_id='model.root.dep',
-                fqn=['root', 'dep'],
-                package_name='root',
-                refs=[['events']],
-                sources=[],
-                depends_on=DependsOn(nodes=['model.root.events']),
-                config=self.model_config,
-                tags=[],
-                path='multi.sql',
-                original_file_path='multi.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-            'model.root.nested': ParsedModelNode(
-                name='nested',
-                database='dbt',
-                schema='analytics',
-                alias='nested',
-                resource_type=NodeType.Model,
-                unique_id='model.root.nested',
-                fqn=['root', 'nested'],
-                package_name='root',
-                refs=[['events']],
-                sources=[],
-                depends_on=DependsOn(nodes=['model.root.dep']),
-                config=self.model_config,
-                tags=[],
-                path='multi.sql',
-                original_file_path='multi.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-            'model.root.sibling': ParsedModelNode(
-                name='sibling',
-                database='dbt',
-                schema='analytics',
-                alias='sibling',
-                resource_type=NodeType.Model,
-                unique_id='model.root.sibling',
-                fqn=['root', 'sibling'],
-                package_name='root',
-                refs=[['events']],
-                sources=[],
-                depends_on=DependsOn(nodes=['model.root.events']),
-                config=self.model_config,
-                tags=[],
-                path='multi.sql',
-                original_file_path='multi.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-            'model.root.multi': ParsedModelNode(
-                name='multi',
-                database='dbt',
-                schema='analytics',
-                alias='multi',
-                resource_type=NodeType.Model,
-                unique_id='model.root.multi',
-                fqn=['root', 'multi'],
-                package_name='root',
-                refs=[['events']],
-                sources=[],
-                depends_on=DependsOn(nodes=['model.root.nested', 'model.root.sibling']),
-                config=self.model_config,
-                tags=[],
-                path='multi.sql',
-                original_file_path='multi.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-        }
-        for node in self.nested_nodes.values():
-            node.validate(node.to_dict())
+        self.model_config = _model_config()
+        self.nested_nodes = _nested_nodes()
 
-    @freezegun.freeze_time('2018-02-14T09:15:13Z')
     def test__no_nodes(self):
         manifest = Manifest(nodes={}, macros={}, docs={},
-                            generated_at=datetime.utcnow(), disabled=[],
+                            generated_at=GENERATED_AT, disabled=[],
                             files={})
         self.assertEqual(
             manifest.writable_manifest().to_dict(),
@@ -201,11 +219,10 @@ class ManifestTest(unittest.TestCase):
             }
         )
 
-    @freezegun.freeze_time('2018-02-14T09:15:13Z')
     def test__nested_nodes(self):
-        nodes = copy.copy(self.nested_nodes)
+        nodes = self.nested_nodes.copy()
         manifest = Manifest(nodes=nodes, macros={}, docs={},
-                            generated_at=datetime.utcnow(), disabled=[],
+                            generated_at=GENERATED_AT, disabled=[],
                             files={})
         serialized = manifest.writable_manifest().to_dict()
         self.assertEqual(serialized['generated_at'], '2018-02-14T09:15:13Z')
@@ -231,8 +248,8 @@ class ManifestTest(unittest.TestCase):
         )
         # order doesn't matter.
         self.assertEqual(
-            set(parent_map['model.root.multi']),
-            set(['model.root.nested', 'model.root.sibling'])
+            frozenset(parent_map['model.root.multi']),
+            MULTI_PARENTS
         )
         self.assertEqual(
             parent_map['model.root.events'],
@@ -260,16 +277,67 @@ class ManifestTest(unittest.TestCase):
             []
         )
         self.assertEqual(
-            set(child_map['model.root.events']),
-            set(['model.root.dep', 'model.root.sibling'])
+            frozenset(child_map['model.root.events']),
+            EVENTS_CHILDREN
         )
         self.assertEqual(
             child_map['model.snowplow.events'],
             []
         )
 
+    def test__nested_nodes_updated(self):
+        nodes = self.nested_nodes.copy()
+        manifest = Manifest(nodes=nodes, macros={}, docs={},
+                            generated_at=datetime.utcnow(), disabled=[],
+                            files={})
+        multi = manifest.nodes['model.root.multi']
+        manifest.update_node(multi.replace(
+            depends_on=DependsOn(nodes=['model.root.events'])
+        ))
+        del manifest.nodes['model.root.nested']
+        writable = manifest.writable_manifest()
+        parent_map = writable.parent_map
+        child_map = writable.child_map
+        self.assertEqual(set(parent_map), set(manifest.nodes))
+        self.assertEqual(set(child_map), set(manifest.nodes))
+        self.assertEqual(
+            parent_map['model.root.multi'],
+            ['model.root.events']
+        )
+        self.assertEqual(
+            child_map['model.root.events'],
+            ['model.root.dep', 'model.root.multi', 'model.root.sibling']
+        )
+        self.assertEqual(child_map['model.root.dep'], [])
+        self.assertEqual(child_map['model.root.sibling'], [])
+
+        # the maps are copies, changing them doesn't change the manifest
+        child_map['model.root.events'].clear()
+        del parent_map['model.root.multi']
+        writable = manifest.writable_manifest()
+        self.assertEqual(
+            writable.child_map['model.root.events'],
+            ['model.root.dep', 'model.root.multi', 'model.root.sibling']
+        )
+        self.assertEqual(
+            writable.parent_map['model.root.multi'],
+            ['model.root.events']
+        )
+
+    def test__nested_nodes_update_unchanged(self):
+        nodes = self.nested_nodes.copy()
+        manifest = Manifest(nodes=nodes, macros={}, docs={},
+                            generated_at=datetime.utcnow(), disabled=[],
+                            files={})
+        before = manifest.writable_manifest()
+        for node in list(manifest.nodes.values()):
+            manifest.update_node(node)
+        after = manifest.writable_manifest()
+        self.assertEqual(after.parent_map, before.parent_map)
+        self.assertEqual(after.child_map, before.child_map)
+
     def test__build_flat_graph(self):
-        nodes = copy.copy(self.nested_nodes)
+        nodes = self.nested_nodes.copy()
         manifest = Manifest(nodes=nodes, macros={}, docs={},
                             generated_at=datetime.utcnow(), disabled=[],
                             files={})
@@ -279,7 +347,7 @@ class ManifestTest(unittest.TestCase):
         self.assertEqual(set(flat_graph), set(['nodes']))
         self.assertEqual(set(flat_nodes), set(self.nested_nodes))
         for node in flat_nodes.values():
-            self.assertEqual(frozenset(node), REQUIRED_PARSED_NODE_KEYS)
+            self.assertEqual(node.keys(), REQUIRED_PARSED_NODE_KEYS)
 
     @mock.patch.object(tracking, 'active_user')
     def test_metadata(self, mock_user):
@@ -299,7 +367,6 @@ class ManifestTest(unittest.TestCase):
         )
 
     @mock.patch.object(tracking, 'active_user')
-    @freezegun.freeze_time('2018-02-14T09:15:13Z')
     def test_no_nodes_with_metadata(self, mock_user):
         mock_user.id = 'cfc9500f-dc7f-4c83-9ea7-2c581c1b38cf'
         mock_user.do_not_track = True
@@ -308,7 +375,7 @@ class ManifestTest(unittest.TestCase):
             adapter_type='postgres',
         )
         manifest = Manifest(nodes={}, macros={}, docs={},
-                            generated_at=datetime.utcnow(), disabled=[],
+                            generated_at=GENERATED_AT, disabled=[],
                             metadata=metadata, files={})
 
         self.assertEqual(
@@ -331,6 +398,29 @@ class ManifestTest(unittest.TestCase):
             }
         )
 
+    def test_find_refable_by_name_updated(self):
+        nodes = self.nested_nodes.copy()
+        manifest = Manifest(nodes=nodes, macros={}, docs={},
+                            generated_at=datetime.utcnow(), disabled=[],
+                            files={})
+        found = manifest.find_refable_by_name('events', None)
+        self.assertEqual(found.unique_id, 'model.snowplow.events')
+        del manifest.nodes['model.snowplow.events']
+        found = manifest.find_refable_by_name('events', None)
+        self.assertEqual(found.unique_id, 'model.root.events')
+
+        renamed = manifest.nodes['model.root.events'].replace(name='renamed')
+        manifest.update_node(renamed)
+        self.assertIsNone(manifest.find_refable_by_name('events', None))
+        self.assertIs(
+            manifest.find_refable_by_name('renamed', 'root'), renamed
+        )
+
+        # a renamed node keeps its place in the search order
+        dep = manifest.nodes['model.root.dep'].replace(name='sibling')
+        manifest.update_node(dep)
+        self.assertIs(manifest.find_refable_by_name('sibling', None), dep)
+
     def test_get_resource_fqns_empty(self):
         manifest = Manifest(nodes={}, macros={}, docs={},
                             generated_at=datetime.utcnow(), disabled=[],
@@ -338,7 +428,7 @@ class ManifestTest(unittest.TestCase):
         self.assertEqual(manifest.get_resource_fqns(), {})
 
     def test_get_resource_fqns(self):
-        nodes = copy.copy(self.nested_nodes)
+        nodes = self.nested_nodes.copy()
         nodes['seed.root.seed'] = ParsedSeedNode(
             name='seed',
             database='dbt',
@@ -383,155 +473,12 @@ class MixedManifestTest(unittest.TestCase):
 
         self.maxDiff = None
 
-        self.model_config = NodeConfig.from_dict({
-            'enabled': True,
-            'materialized': 'view',
-            'persist_docs': {},
-            'post-hook': [],
-            'pre-hook': [],
-            'vars': {},
-            'quoting': {},
-            'column_types': {},
-            'tags': [],
-        })
-
-        self.nested_nodes = {
-            'model.snowplow.events': CompiledModelNode(
-                name='events',
-                database='dbt',
-                schema='analytics',
-                alias='events',
-                resource_type=NodeType.Model,
-                unique_id='model.snowplow.events',
-                fqn=['snowplow', 'events'],
-                package_name='snowplow',
-                refs=[],
-                sources=[],
-                depends_on=DependsOn(),
-                config=self.model_config,
-                tags=[],
-                path='events.sql',
-                original_file_path='events.sql',
-                root_path='',
-                raw_sql='does not matter',
-                meta={},
-                compiled=True,
-                compiled_sql='also does not matter',
-                extra_ctes_injected=True,
-                injected_sql=None,
-                extra_ctes=[]
-            ),
-            'model.root.events': CompiledModelNode(
-                name='events',
-                database='dbt',
-                schema='analytics',
-                alias='events',
-                resource_type=NodeType.Model,
-                unique_id='model.root.events',
-                fqn=['root', 'events'],
-                package_name='root',
-                refs=[],
-                sources=[],
-                depends_on=DependsOn(),
-                config=self.model_config,
-                tags=[],
-                path='events.sql',
-                original_file_path='events.sql',
-                root_path='',
-                raw_sql='does not matter',
-                meta={},
-                compiled=True,
-                compiled_sql='also does not matter',
-                extra_ctes_injected=True,
-                injected_sql='and this also does not matter',
-                extra_ctes=[]
-            ),
-            'model.root.dep': ParsedModelNode(
-                name='dep',
-                database='dbt',
-                schema='analytics',
-                alias='dep',
-                resource_type=NodeType.Model,
-                unique_id='model.root.dep',
-                fqn=['root', 'dep'],
-                package_name='root',
-                refs=[['events']],
-                sources=[],
-                depends_on=DependsOn(nodes=['model.root.events']),
-                config=self.model_config,
-                tags=[],
-                path='multi.sql',
-                original_file_path='multi.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-            'model.root.nested': ParsedModelNode(
-                name='nested',
-                database='dbt',
-                schema='analytics',
-                alias='nested',
-                resource_type=NodeType.Model,
-                unique_id='model.root.nested',
-                fqn=['root', 'nested'],
-                package_name='root',
-                refs=[['events']],
-                sources=[],
-                depends_on=DependsOn(nodes=['model.root.dep']),
-                config=self.model_config,
-                tags=[],
-                path='multi.sql',
-                original_file_path='multi.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-            'model.root.sibling': ParsedModelNode(
-                name='sibling',
-                database='dbt',
-                schema='analytics',
-                alias='sibling',
-                resource_type=NodeType.Model,
-                unique_id='model.root.sibling',
-                fqn=['root', 'sibling'],
-                package_name='root',
-                refs=[['events']],
-                sources=[],
-                depends_on=DependsOn(nodes=['model.root.events']),
-                config=self.model_config,
-                tags=[],
-                path='multi.sql',
-                original_file_path='multi.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-            'model.root.multi': ParsedModelNode(
-                name='multi',
-                database='dbt',
-                schema='analytics',
-                alias='multi',
-                resource_type=NodeType.Model,
-                unique_id='model.root.multi',
-                fqn=['root', 'multi'],
-                package_name='root',
-                refs=[['events']],
-                sources=[],
-                depends_on=DependsOn(nodes=['model.root.nested', 'model.root.sibling']),
-                config=self.model_config,
-                tags=[],
-                path='multi.sql',
-                original_file_path='multi.sql',
-                root_path='',
-                meta={},
-                raw_sql='does not matter'
-            ),
-        }
+        self.model_config = _model_config()
+        self.nested_nodes = _mixed_nested_nodes()
 
-    @freezegun.freeze_time('2018-02-14T09:15:13Z')
     def test__no_nodes(self):
         manifest = Manifest(nodes={}, macros={}, docs={},
-                            generated_at=datetime.utcnow(), disabled=[],
+                            generated_at=GENERATED_AT, disabled=[],
                             files={})
         self.assertEqual(
             manifest.writable_manifest().to_dict(),
@@ -548,11 +495,10 @@ class MixedManifestTest(unittest.TestCase):
             }
         )
 
-    @freezegun.freeze_time('2018-02-14T09:15:13Z')
     def test__nested_nodes(self):
-        nodes = copy.copy(self.nested_nodes)
+        nodes = self.nested_nodes.copy()
         manifest = Manifest(nodes=nodes, macros={}, docs={},
-                            generated_at=datetime.utcnow(), disabled=[],
+                            generated_at=GENERATED_AT, disabled=[],
                             files={})
         serialized = manifest.writable_manifest().to_dict()
         self.assertEqual(serialized['generated_at'], '2018-02-14T09:15:13Z')
@@ -576,8 +522,8 @@ class MixedManifestTest(unittest.TestCase):
         )
         # order doesn't matter.
         self.assertEqual(
-            set(parent_map['model.root.multi']),
-            set(['model.root.nested', 'model.root.sibling'])
+            frozenset(parent_map['model.root.multi']),
+            MULTI_PARENTS
         )
         self.assertEqual(
             parent_map['model.root.events'],
@@ -605,8 +551,8 @@ class MixedManifestTest(unittest.TestCase):
             []
         )
         self.assertEqual(
-            set(child_map['model.root.events']),
-            set(['model.root.dep', 'model.root.sibling'])
+            frozenset(child_map['model.root.events']),
+            EVENTS_CHILDREN
         )
         self.assertEqual(
             child_map['model.snowplow.events'],
@@ -614,7 +560,7 @@ class MixedManifestTest(unittest.TestCase):
         )
 
     def test__build_flat_graph(self):
-        nodes = copy.copy(self.nested_nodes)
+        nodes = self.nested_nodes.copy()
         manifest = Manifest(nodes=nodes, macros={}, docs={},
                             generated_at=datetime.utcnow(), disabled=[],
                             files={})
@@ -626,25 +572,36 @@ class MixedManifestTest(unittest.TestCase):
         compiled_count = 0
         for node in flat_nodes.values():
             if node.get('compiled'):
-                self.assertEqual(frozenset(node), REQUIRED_COMPILED_NODE_KEYS)
+                expected_keys = REQUIRED_COMPILED_NODE_KEYS
                 compiled_count += 1
             else:
-                self.assertEqual(frozenset(node), REQUIRED_PARSED_NODE_KEYS)
+                expected_keys = REQUIRED_PARSED_NODE_KEYS
+            # dict keys views compare equal to sets with the same members
+            self.assertEqual(node.keys(), expected_keys)
         self.assertEqual(compiled_count, 2)
 
 
 # Tests of the manifest search code (find_X_by_Y)
 
+def _mock(cls, **kwargs):
+    """Make a bare instance of `cls` with only the given attributes set. This
+    is much cheaper to build than a MagicMock, and still passes the
+    isinstance() checks in the manifest search code.
+    """
+    obj = cls.__new__(cls)
+    obj.__dict__.update(kwargs)
+    return obj
+
+
 def MockMacro(package, name='my_macro', kwargs={}):
-    macro = mock.MagicMock(
-        __class__=ParsedMacro,
+    return _mock(
+        ParsedMacro,
+        name=name,
         resource_type=NodeType.Macro,
         package_name=package,
         unique_id=f'macro.{package}.{name}',
         **kwargs
     )
-    macro.name = name
-    return macro
 
 
 def MockMaterialization(package, name='my_materialization', adapter_type=None, kwargs={}):
@@ -660,17 +617,15 @@ def MockGenerateMacro(package, component='some_component', kwargs={}):
 
 
 def MockSource(package, source_name, name, kwargs={}):
-    src = mock.MagicMock(
-        __class__=ParsedSourceDefinition,
+    return _mock(
+        ParsedSourceDefinition,
+        name=name,
         resource_type=NodeType.Source,
         source_name=source_name,
         package_name=package,
         unique_id=f'source.{package}.{source_name}.{name}',
-        search_name=f'{source_name}.{name}',
         **kwargs
     )
-    src.name = name
-    return src
 
 
 def MockNode(package, name, resource_type=NodeType.Model, kwargs={}):
@@ -680,28 +635,25 @@ def MockNode(package, name, resource_type=NodeType.Model, kwargs={}):
         cls = ParsedSeedNode
     else:
         raise ValueError(f'I do not know how to handle {resource_type}')
-    node = mock.MagicMock(
-        __class__=cls,
+    return _mock(
+        cls,
+        name=name,
         resource_type=resource_type,
         package_name=package,
         unique_id=f'macro.{package}.{name}',
-        search_name=name,
+        depends_on=DependsOn(),
         **kwargs
     )
-    node.name = name
-    return node
 
 
 def MockDocumentation(package, name, kwargs={}):
-    doc = mock.MagicMock(
-        __class__=ParsedDocumentation,
+    return _mock(
+        ParsedDocumentation,
+        name=name,
         resource_type=NodeType.Documentation,
         package_name=package,
-        search_name=name,
         unique_id=f'{package}.{name}',
     )
-    doc.name = name
-    return doc
 
 
 class TestManifestSearch(unittest.TestCase):
@@ -754,71 +706,69 @@ def make_manifest(nodes=[], macros=[], docs=[]):
     )
 
 
-FindMacroSpec = namedtuple('FindMacroSpec', 'macros,expected')
-
-macro_parameter_sets = [
-    # empty
-    FindMacroSpec(
-        macros=[],
-        expected={None: None, 'root': None, 'dep': None, 'dbt': None},
-    ),
-
-    # just root
-    FindMacroSpec(
-        macros=[MockMacro('root')],
-        expected={None: 'root', 'root': 'root', 'dep': None, 'dbt': None},
-    ),
-
-    # just dep
-    FindMacroSpec(
-        macros=[MockMacro('dep')],
-        expected={None: 'dep', 'root': None, 'dep': 'dep', 'dbt': None},
-    ),
-
-    # just dbt
-    FindMacroSpec(
-        macros=[MockMacro('dbt')],
-        expected={None: 'dbt', 'root': None, 'dep': None, 'dbt': 'dbt'},
-    ),
-
-    # root overrides dep
-    FindMacroSpec(
-        macros=[MockMacro('root'), MockMacro('dep')],
-        expected={None: 'root', 'root': 'root', 'dep': 'dep', 'dbt': None},
-    ),
-
-    # root overrides core
-    FindMacroSpec(
-        macros=[MockMacro('root'), MockMacro('dbt')],
-        expected={None: 'root', 'root': 'root', 'dep': None, 'dbt': 'dbt'},
-    ),
-
-    # dep overrides core
-    FindMacroSpec(
-        macros=[MockMacro('dep'), MockMacro('dbt')],
-        expected={None: 'dep', 'root': None, 'dep': 'dep', 'dbt': 'dbt'},
-    ),
-
-    # root overrides dep overrides core
-    FindMacroSpec(
-        macros=[MockMacro('root'), MockMacro('dep'), MockMacro('dbt')],
-        expected={None: 'root', 'root': 'root', 'dep': 'dep', 'dbt': 'dbt'},
-    ),
-]
+# The search test parameter sets describe their mocks with hashable spec
+# records like ('mat', package, adapter_type) instead of holding mock objects,
+# so the mocks are only built for the tests that actually run.
+# Manifests only read their macros, so materialization mocks are built once
+# per (package, adapter_type) and shared between them.
+@lru_cache(maxsize=None)
+def _mat(package, adapter_type):
+    return MockMaterialization(package, adapter_type=adapter_type)
+
+
+_MOCK_FACTORIES = {
+    'macro': MockMacro,
+    'generate': MockGenerateMacro,
+    'mat': _mat,
+    'node': MockNode,
+    'source': MockSource,
+    'doc': MockDocumentation,
+}
+
+
+def build_mocks(specs):
+    return [_MOCK_FACTORIES[kind](*args) for kind, *args in specs]
+
+
+# The search tests only read from the manifest they build, so parameter sets
+# with the same specs can share one.
+@lru_cache(maxsize=None)
+def cached_manifest(nodes=(), macros=(), docs=()):
+    return make_manifest(
+        nodes=build_mocks(nodes),
+        macros=build_mocks(macros),
+        docs=build_mocks(docs),
+    )
+
+
+# packages in the order they are searched
+MACRO_PACKAGES = ('root', 'dep', 'dbt')
+
+
+def _package_subsets():
+    """Every subset of MACRO_PACKAGES, each in search order."""
+    for mask in product((False, True), repeat=len(MACRO_PACKAGES)):
+        yield tuple(p for p, present in zip(MACRO_PACKAGES, mask) if present)
+
 
+def _macro_spec(packages, expected):
+    macro_names = '__'.join(packages)
+    return pytest.param(packages, expected, id=f'm_[{macro_names}]')
 
-def id_macro(arg):
-    if isinstance(arg, list):
-        macro_names = '__'.join(f'{m.package_name}' for m in arg)
-        return f'm_[{macro_names}]'
-    if isinstance(arg, dict):
-        arg_names = '__'.join(f'{k}_{v}' for k, v in arg.items())
-        return f'exp_{{{arg_names}}}'
+
+def _macro_parameter_sets():
+    for packages in _package_subsets():
+        # with no package given, root overrides dep overrides core
+        expected = {None: packages[0] if packages else None}
+        expected.update(
+            (p, p if p in packages else None) for p in MACRO_PACKAGES
+        )
+        yield _macro_spec(packages, expected)
 
 
-@pytest.mark.parametrize('macros,expectations', macro_parameter_sets, ids=id_macro)
-def test_find_macro_by_name(macros, expectations):
-    manifest = make_manifest(macros=macros)
+@pytest.mark.parametrize('packages,expectations', _macro_parameter_sets())
+def test_find_macro_by_name(packages, expectations):
+    manifest = cached_manifest(macros=tuple(('macro', p) for p in packages))
     for package, expected in expectations.items():
         result = manifest.find_macro_by_name(name='my_macro', root_project_name='root', package=package)
         if expected is None:
@@ -827,61 +777,24 @@ def test_find_macro_by_name(macros, expectations):
             assert result.package_name == expected
 
 
-# these don't use a search package, so we don't need to do as much
-generate_name_parameter_sets = [
-    # empty
-    FindMacroSpec(
-        macros=[],
-        expected=None,
-    ),
-
-    # just root
-    FindMacroSpec(
-        macros=[MockGenerateMacro('root')],
-        expected='root',
-    ),
-
-    # just dep
-    FindMacroSpec(
-        macros=[MockGenerateMacro('dep')],
-        expected=None,
-    ),
-
-    # just dbt
-    FindMacroSpec(
-        macros=[MockGenerateMacro('dbt')],
-        expected='dbt',
-    ),
-
-    # root overrides dep
-    FindMacroSpec(
-        macros=[MockGenerateMacro('root'), MockGenerateMacro('dep')],
-        expected='root',
-    ),
-
-    # root overrides core
-    FindMacroSpec(
-        macros=[MockGenerateMacro('root'), MockGenerateMacro('dbt')],
-        expected='root',
-    ),
-
-    # dep overrides core
-    FindMacroSpec(
-        macros=[MockGenerateMacro('dep'), MockGenerateMacro('dbt')],
-        expected='dbt',
-    ),
-
-    # root overrides dep overrides core
-    FindMacroSpec(
-        macros=[MockGenerateMacro('root'), MockGenerateMacro('dep'), MockGenerateMacro('dbt')],
-        expected='root',
-    ),
-]
+def _generate_name_parameter_sets():
+    # these don't use a search package, so we don't need to do as much. Root
+    # overrides core, and imported packages are ignored.
+    for packages in _package_subsets():
+        if 'root' in packages:
+            expected = 'root'
+        elif 'dbt' in packages:
+            expected = 'dbt'
+        else:
+            expected = None
+        yield _macro_spec(packages, expected)
 
 
-@pytest.mark.parametrize('macros,expected', generate_name_parameter_sets, ids=id_macro)
-def test_find_generate_macro_by_name(macros, expected):
-    manifest = make_manifest(macros=macros)
+@pytest.mark.parametrize('packages,expected', _generate_name_parameter_sets())
+def test_find_generate_macro_by_name(packages, expected):
+    manifest = cached_manifest(
+        macros=tuple(('generate', p) for p in packages)
+    )
     result = manifest.find_generate_macro_by_name(
         component='some_component', root_project_name='root'
     )
@@ -891,18 +804,71 @@ def test_find_generate_macro_by_name(macros, expected):
         assert result.package_name == expected
 
 
-FindMaterializationSpec = namedtuple('FindMaterializationSpec', 'macros,adapter_type,expected')
+# how each kind of mock spec appears in test ids: the package name, then the
+# adapter type of materializations or the search name of everything else
+_SPEC_ID_NAMES = {
+    'mat': lambda package, atype: f'{package}_{atype or "default"}',
+    'node': lambda package, name: f'{package}_{name}',
+    'source': lambda package, source, name: f'{package}_{source}.{name}',
+    'doc': lambda package, name: f'{package}_{name}',
+}
+
+
+def _mocks_id(specs):
+    names = '__'.join(_SPEC_ID_NAMES[kind](*args) for kind, *args in specs)
+    return f'm_[{names}]'
+
+
+def _expected_id(expected):
+    if expected is None:
+        return 'None'
+    return '_'.join(expected)
+
+
+def _search_param(mocks, expectations):
+    """Build the pytest.param for a search test that looks up the same
+    mocks once for each (package, expected) pair in expectations.
+    """
+    names = '__'.join(f'{k}_{_expected_id(v)}' for k, v in expectations)
+    test_id = f'{_mocks_id(mocks)}-exp_{{{names}}}'
+    return pytest.param(mocks, expectations, id=test_id)
+
+
+# The pytest.params, with their test ids, are built once when the parameter
+# sets are built instead of on every collection.
+@dataclass(frozen=True)
+class FindMaterializationSpec:
+    macros: tuple
+    adapter_type: Optional[str]
+    expected: Optional[tuple]
+
+    def param(self):
+        test_id = '-'.join([
+            _mocks_id(self.macros),
+            str(self.adapter_type),
+            _expected_id(self.expected),
+        ])
+        return pytest.param(
+            self.macros, self.adapter_type, self.expected, id=test_id
+        )
+
+
+# a matching and a default materialization in every package
+_ALL_MATS = tuple(
+    ('mat', project, atype)
+    for (project, atype) in product(MACRO_PACKAGES, ('foo', None))
+)
 
 
 def _materialization_parameter_sets():
     sets = [
-        FindMaterializationSpec(macros=[], adapter_type='foo', expected=None),
+        FindMaterializationSpec(macros=(), adapter_type='foo', expected=None),
     ]
 
     # default only, each project
     sets.extend(
         FindMaterializationSpec(
-            macros=[MockMaterialization(project, adapter_type=None)],
+            macros=(('mat', project, None),),
             adapter_type='foo',
             expected=(project, 'default'),
         ) for project in ['root', 'dep', 'dbt']
@@ -911,7 +877,7 @@ def _materialization_parameter_sets():
     # other type only, each project
     sets.extend(
         FindMaterializationSpec(
-            macros=[MockMaterialization(project, adapter_type='bar')],
+            macros=(('mat', project, 'bar'),),
             adapter_type='foo',
             expected=None,
         ) for project in ['root', 'dep', 'dbt']
@@ -920,7 +886,7 @@ def _materialization_parameter_sets():
     # matching type only, each project
     sets.extend(
         FindMaterializationSpec(
-            macros=[MockMaterialization(project, adapter_type='foo')],
+            macros=(('mat', project, 'foo'),),
             adapter_type='foo',
             expected=(project, 'foo'),
         ) for project in ['root', 'dep', 'dbt']
@@ -929,40 +895,52 @@ def _materialization_parameter_sets():
     sets.extend([
         # matching type and default everywhere
         FindMaterializationSpec(
-            macros=[MockMaterialization(project, adapter_type=atype) for (project, atype) in product(['root', 'dep', 'dbt'], ['foo', None])],
+            macros=_ALL_MATS,
             adapter_type='foo',
             expected=('root', 'foo')
         ),
         # default in core, override is in dep, and root has unrelated override
         # should find the dep override.
         FindMaterializationSpec(
-            macros=[MockMaterialization('root', adapter_type='bar'), MockMaterialization('dep', adapter_type='foo'), MockMaterialization('dbt', adapter_type=None)],
+            macros=(
+                ('mat', 'root', 'bar'),
+                ('mat', 'dep', 'foo'),
+                ('mat', 'dbt', None),
+            ),
             adapter_type='foo',
             expected=('dep', 'foo'),
         ),
         # default in core, unrelated override is in dep, and root has an override
         # should find the root override.
         FindMaterializationSpec(
-            macros=[MockMaterialization('root', adapter_type='foo'), MockMaterialization('dep', adapter_type='bar'), MockMaterialization('dbt', adapter_type=None)],
+            macros=(
+                ('mat', 'root', 'foo'),
+                ('mat', 'dep', 'bar'),
+                ('mat', 'dbt', None),
+            ),
             adapter_type='foo',
             expected=('root', 'foo'),
         ),
         # default in core, override is in dep, and root has an override too.
         # should find the root override.
         FindMaterializationSpec(
-            macros=[MockMaterialization('root', adapter_type='foo'), MockMaterialization('dep', adapter_type='foo'), MockMaterialization('dbt', adapter_type=None)],
+            macros=(
+                ('mat', 'root', 'foo'),
+                ('mat', 'dep', 'foo'),
+                ('mat', 'dbt', None),
+            ),
             adapter_type='foo',
             expected=('root', 'foo'),
         ),
         # core has default + adapter, dep has adapter, root has default
         # should find the dependency implementation, because it's the most specific
         FindMaterializationSpec(
-            macros=[
-                MockMaterialization('root', adapter_type=None),
-                MockMaterialization('dep', adapter_type='foo'),
-                MockMaterialization('dbt', adapter_type=None),
-                MockMaterialization('dbt', adapter_type='foo'),
-            ],
+            macros=(
+                ('mat', 'root', None),
+                ('mat', 'dep', 'foo'),
+                ('mat', 'dbt', None),
+                ('mat', 'dbt', 'foo'),
+            ),
             adapter_type='foo',
             expected=('dep', 'foo'),
         ),
@@ -971,21 +949,15 @@ def _materialization_parameter_sets():
     return sets
 
 
-def id_mat(arg):
-    if isinstance(arg, list):
-        macro_names = '__'.join(f'{m.package_name}_{m.adapter_type}' for m in arg)
-        return f'm_[{macro_names}]'
-    elif isinstance(arg, tuple):
-        return '_'.join(arg)
+_MAT_SETS = [s.param() for s in _materialization_parameter_sets()]
 
 
 @pytest.mark.parametrize(
     'macros,adapter_type,expected',
-    _materialization_parameter_sets(),
-    ids=id_mat,
+    _MAT_SETS,
 )
 def test_find_materialization_by_name(macros, adapter_type, expected):
-    manifest = make_manifest(macros=macros)
+    manifest = cached_manifest(macros=macros)
     result = manifest.find_materialization_macro_by_name(
         project_name='root',
         materialization_name='my_materialization',
@@ -999,208 +971,199 @@ def test_find_materialization_by_name(macros, adapter_type, expected):
         assert result.package_name == expected_package
 
 
-FindNodeSpec = namedtuple('FindNodeSpec', 'nodes,package,expected')
+# Parameter sets that search the same nodes for different packages share a
+# spec, with the expected result for each package in `expectations`.
+@dataclass(frozen=True)
+class FindNodeSpec:
+    nodes: tuple
+    # (package, expected) pairs
+    expectations: tuple
 
 
 def _refable_parameter_sets():
-    sets = [
+    return [
         # empties
-        FindNodeSpec(nodes=[], package=None, expected=None),
-        FindNodeSpec(nodes=[], package='root', expected=None),
-    ]
-    sets.extend(
+        FindNodeSpec(nodes=(), expectations=((None, None), ('root', None))),
+
         # only one model, no package specified -> find it in any package
         FindNodeSpec(
-            nodes=[MockNode(project, 'my_model')],
-            package=None,
-            expected=(project, 'my_model'),
-        ) for project in ['root', 'dep']
-    )
-    # only one model, no package specified -> find it in any package
-    sets.extend([
-        FindNodeSpec(
-            nodes=[MockNode('root', 'my_model')],
-            package='root',
-            expected=('root', 'my_model'),
+            nodes=(('node', 'root', 'my_model'),),
+            expectations=(
+                (None, ('root', 'my_model')),
+                ('root', ('root', 'my_model')),
+            ),
         ),
         FindNodeSpec(
-            nodes=[MockNode('dep', 'my_model')],
-            package='root',
-            expected=None,
+            nodes=(('node', 'dep', 'my_model'),),
+            expectations=((None, ('dep', 'my_model')), ('root', None)),
         ),
 
         # a source with that name exists, but not a refable
         FindNodeSpec(
-            nodes=[MockSource('root', 'my_source', 'my_model')],
-            package=None,
-            expected=None
+            nodes=(('source', 'root', 'my_source', 'my_model'),),
+            expectations=((None, None),),
         ),
 
         # a source with that name exists, and a refable
         FindNodeSpec(
-            nodes=[MockSource('root', 'my_source', 'my_model'), MockNode('root', 'my_model')],
-            package=None,
-            expected=('root', 'my_model'),
-        ),
-        FindNodeSpec(
-            nodes=[MockSource('root', 'my_source', 'my_model'), MockNode('root', 'my_model')],
-            package='root',
-            expected=('root', 'my_model'),
-        ),
-        FindNodeSpec(
-            nodes=[MockSource('root', 'my_source', 'my_model'), MockNode('root', 'my_model')],
-            package='dep',
-            expected=None,
+            nodes=(
+                ('source', 'root', 'my_source', 'my_model'),
+                ('node', 'root', 'my_model'),
+            ),
+            expectations=(
+                (None, ('root', 'my_model')),
+                ('root', ('root', 'my_model')),
+                ('dep', None),
+            ),
         ),
-
-    ])
-    return sets
+    ]
 
 
-def id_nodes(arg):
-    if isinstance(arg, list):
-        node_names = '__'.join(f'{n.package_name}_{n.search_name}' for n in arg)
-        return f'm_[{node_names}]'
-    elif isinstance(arg, tuple):
-        return '_'.join(arg)
+_REF_SETS = [
+    _search_param(s.nodes, s.expectations)
+    for s in _refable_parameter_sets()
+]
 
 
-@pytest.mark.parametrize(
-    'nodes,package,expected',
-    _refable_parameter_sets(),
-    ids=id_nodes,
-)
-def test_find_refable_by_name(nodes, package, expected):
-    manifest = make_manifest(nodes=nodes)
-    result = manifest.find_refable_by_name(name='my_model', package=package)
-    if expected is None:
-        assert result is expected
-    else:
-        assert result is not None
-        assert len(expected) == 2
-        expected_package, expected_name = expected
-        assert result.name == expected_name
-        assert result.package_name == expected_package
+@pytest.mark.parametrize('nodes,expectations', _REF_SETS)
+def test_find_refable_by_name(nodes, expectations):
+    manifest = cached_manifest(nodes=nodes)
+    for package, expected in expectations:
+        result = manifest.find_refable_by_name(
+            name='my_model', package=package
+        )
+        msg = f'package={package}'
+        if expected is None:
+            assert result is expected, msg
+        else:
+            assert result is not None, msg
+            assert len(expected) == 2
+            expected_package, expected_name = expected
+            assert result.name == expected_name, msg
+            assert result.package_name == expected_package, msg
 
 
 def _source_parameter_sets():
-    sets = [
+    found = ('root', 'my_source', 'my_table')
+    return [
         # empties
-        FindNodeSpec(nodes=[], package=None, expected=None),
-        FindNodeSpec(nodes=[], package='root', expected=None),
-    ]
-    sets.extend(
+        FindNodeSpec(nodes=(), expectations=((None, None), ('root', None))),
+
         # models with the name, but not sources
         FindNodeSpec(
-            nodes=[MockNode('root', name)],
-            package=project,
-            expected=None,
-        )
-        for project in ('root', None) for name in ('my_source', 'my_table')
-    )
-    # exists in root alongside nodes with name parts
-    sets.extend(
+            nodes=(('node', 'root', 'my_source'),),
+            expectations=(('root', None), (None, None)),
+        ),
         FindNodeSpec(
-            nodes=[MockSource('root', 'my_source', 'my_table'), MockNode('root', 'my_source'), MockNode('root', 'my_table')],
-            package=project,
-            expected=('root', 'my_source', 'my_table'),
-        )
-        for project in ('root', None)
-    )
-    sets.extend(
+            nodes=(('node', 'root', 'my_table'),),
+            expectations=(('root', None), (None, None)),
+        ),
+
+        # exists in root alongside nodes with name parts
+        FindNodeSpec(
+            nodes=(
+                ('source', 'root', 'my_source', 'my_table'),
+                ('node', 'root', 'my_source'),
+                ('node', 'root', 'my_table'),
+            ),
+            expectations=(('root', found), (None, found)),
+        ),
+
         # wrong source name
         FindNodeSpec(
-            nodes=[MockSource('root', 'my_other_source', 'my_table')],
-            package=project,
-            expected=None,
-        )
-        for project in ('root', None)
-    )
-    sets.extend(
+            nodes=(('source', 'root', 'my_other_source', 'my_table'),),
+            expectations=(('root', None), (None, None)),
+        ),
+
         # wrong table name
         FindNodeSpec(
-            nodes=[MockSource('root', 'my_source', 'my_other_table')],
-            package=project,
-            expected=None,
-        )
-        for project in ('root', None)
-    )
-    sets.append(
+            nodes=(('source', 'root', 'my_source', 'my_other_table'),),
+            expectations=(('root', None), (None, None)),
+        ),
+
         # wrong project name (should not be found in 'root')
         FindNodeSpec(
-            nodes=[MockSource('other', 'my_source', 'my_table')],
-            package='root',
-            expected=None,
-        )
-    )
-    sets.extend(
+            nodes=(('source', 'other', 'my_source', 'my_table'),),
+            expectations=(('root', None),),
+        ),
+
         # exists in root check various projects (other project -> not found)
         FindNodeSpec(
-            nodes=[MockSource('root', 'my_source', 'my_table')],
-            package=project,
-            expected=('root', 'my_source', 'my_table'),
-        )
-        for project in ('root', None)
-    )
+            nodes=(('source', 'root', 'my_source', 'my_table'),),
+            expectations=(('root', found), (None, found)),
+        ),
+    ]
 
-    return sets
 
+_SOURCE_SETS = [
+    _search_param(s.nodes, s.expectations)
+    for s in _source_parameter_sets()
+]
 
-@pytest.mark.parametrize(
-    'nodes,package,expected',
-    _source_parameter_sets(),
-    ids=id_nodes,
-)
-def test_find_source_by_name(nodes, package, expected):
-    manifest = make_manifest(nodes=nodes)
-    result = manifest.find_source_by_name(source_name='my_source', table_name='my_table', package=package)
-    if expected is None:
-        assert result is expected
-    else:
-        assert result is not None
-        assert len(expected) == 3
-        expected_package, expected_source_name, expected_name = expected
-        assert result.source_name == expected_source_name
-        assert result.name == expected_name
-        assert result.package_name == expected_package
+
+@pytest.mark.parametrize('nodes,expectations', _SOURCE_SETS)
+def test_find_source_by_name(nodes, expectations):
+    manifest = cached_manifest(nodes=nodes)
+    for package, expected in expectations:
+        result = manifest.find_source_by_name(
+            source_name='my_source', table_name='my_table', package=package
+        )
+        msg = f'package={package}'
+        if expected is None:
+            assert result is expected, msg
+        else:
+            assert result is not None, msg
+            assert len(expected) == 3
+            expected_package, expected_source_name, expected_name = expected
+            assert result.source_name == expected_source_name, msg
+            assert result.name == expected_name, msg
+            assert result.package_name == expected_package, msg
 
 
-FindDocSpec = namedtuple('FindDocSpec', 'docs,package,expected')
+@dataclass(frozen=True)
+class FindDocSpec:
+    docs: tuple
+    # (package, expected) pairs
+    expectations: tuple
 
 
 def _docs_parameter_sets():
-    sets = []
-    sets.extend(
+    return [
         # empty
-        FindDocSpec(docs=[], package=project, expected=None)
-        for project in ('root', None)
-    )
-    sets.extend(
+        FindDocSpec(docs=(), expectations=(('root', None), (None, None))),
         # basic: exists in root
-        FindDocSpec(docs=[MockDocumentation('root', 'my_doc')], package=project, expected=('root', 'my_doc'))
-        for project in ('root', None)
-    )
-    sets.extend([
+        FindDocSpec(
+            docs=(('doc', 'root', 'my_doc'),),
+            expectations=(
+                ('root', ('root', 'my_doc')),
+                (None, ('root', 'my_doc')),
+            ),
+        ),
         # exists in other
-        FindDocSpec(docs=[MockDocumentation('dep', 'my_doc')], package='root', expected=None),
-        FindDocSpec(docs=[MockDocumentation('dep', 'my_doc')], package=None, expected=('dep', 'my_doc')),
-    ])
-    return sets
+        FindDocSpec(
+            docs=(('doc', 'dep', 'my_doc'),),
+            expectations=(('root', None), (None, ('dep', 'my_doc'))),
+        ),
+    ]
 
 
-@pytest.mark.parametrize(
-    'docs,package,expected',
-    _docs_parameter_sets(),
-    ids=id_nodes,
-)
-def test_find_doc_by_name(docs, package, expected):
-    manifest = make_manifest(docs=docs)
-    result = manifest.find_docs_by_name(name='my_doc', package=package)
-    if expected is None:
-        assert result is expected
-    else:
-        assert result is not None
-        assert len(expected) == 2
-        expected_package, expected_name = expected
-        assert result.name == expected_name
-        assert result.package_name == expected_package
+_DOC_SETS = [
+    _search_param(s.docs, s.expectations)
+    for s in _docs_parameter_sets()
+]
+
+
+@pytest.mark.parametrize('docs,expectations', _DOC_SETS)
+def test_find_doc_by_name(docs, expectations):
+    manifest = cached_manifest(docs=docs)
+    for package, expected in expectations:
+        result = manifest.find_docs_by_name(name='my_doc', package=package)
+        msg = f'package={package}'
+        if expected is None:
+            assert result is expected, msg
+        else:
+            assert result is not None, msg
+            assert len(expected) == 2
+            expected_package, expected_name = expected
+            assert result.name == expected_name, msg
+            assert result.package_name == expected_package, msg